@@ -1,12 +1,34 @@
 import streamlit as st
 import requests
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+from http.cookiejar import LoadError, LWPCookieJar
+from pathlib import Path
+import codecs
+import hashlib
+import io
+import pickle
+import tempfile
 import time
-import numpy as np
+import uuid
 import re 
-from typing import List, Optional
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+try:
+    # orjson encodes/decodes several times faster than the stdlib json used by requests
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:  # Fallback when orjson is not installed
+    import json
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    json_loads = json.loads
 
 # --- CRITICAL FIX: Ensure this is the first Streamlit command ---
 st.set_page_config(
@@ -17,53 +39,156 @@ st.set_page_config(
 
 # ================== CONFIG ==================
 URL = "https://www.lvmh.com/api/search"
+JOB_OFFERS_URL = "https://www.lvmh.com/en/join-us/our-job-offers"  # Visited to obtain the site cookies
 REGIONS_ALL = ["America", "Asia Pacific", "Europe", "Middle East / Africa"]
-HITS_PER_PAGE = 50
-SESSION_MAX_AGE = 30 * 60 # 30 minutes
-
-# ================== GLOBAL SESSION ==================
-SESSION = None
-SESSION_TIMESTAMP = None
-
+HITS_PER_PAGE = 1000  # Algolia maximum; a server-side cap is reflected in the returned nbPages
+SCRAPE_CACHE_TTL = 60 * 60  # 1 hour in memory (scrape_jobs and the derived st.cache_data entries)
+# Disk files are reused for half the TTL: a reloaded file then stays in memory for a full TTL,
+# so served results are at most 1.5 x SCRAPE_CACHE_TTL (90 minutes) old
+SCRAPE_DISK_MAX_AGE = SCRAPE_CACHE_TTL // 2
+APP_DIR = Path(__file__).resolve().parent  # On-disk state lives next to the app, not in the cwd
+SCRAPE_CACHE_DIR = APP_DIR / ".lvmh_cache"
+MAX_WORKERS = 8  # Max in-flight page requests (polite concurrency)
+SESSION_MAX_AGE = 30 * 60 # 30 minutes, then the session is rebuilt with fresh cookies
+COOKIE_JAR_PATH = APP_DIR / ".lvmh_cookies.txt"  # Primed cookies, reused across app restarts
+# Low-cardinality label columns, stored as pandas categoricals
+CATEGORY_COLUMNS = ['maison', 'contract', 'fullTimePartTime', 'city', 'functionFilter']
+# Any run of characters that cannot appear in a slug; collapsed to a single hyphen
+SLUG_SEPARATOR_PATTERN = r'[^a-z0-9]+'
+# Hit attributes create_filtered_df works from (the raw downloads keep every field the API returns)
+FILTERED_SOURCE_FIELDS = ['name', 'maison', 'contract', 'description', 'city', 'functionFilter',
+                          'fullTimePartTime', 'link', 'profile', 'jobResponsabilities', 'salary']
+
+# Copy-on-Write lets create_filtered_df work on the shared raw frame without a defensive copy
+# (always on from pandas 3, where the option is deprecated)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# ================== SHARED SESSION ==================
+def load_saved_cookies(session: requests.Session) -> bool:
+    """Loads cookies saved by a recent process into the session; False if none are usable."""
+    jar = LWPCookieJar(COOKIE_JAR_PATH)
+    try:
+        if time.time() - COOKIE_JAR_PATH.stat().st_mtime >= SESSION_MAX_AGE:
+            return False
+        jar.load(ignore_discard=True)  # Cookies past their own expiry date are dropped here
+    except (OSError, LoadError):
+        return False
+    if not len(jar):
+        return False
+    session.cookies.update(jar)
+    return True
+
+def save_cookies(session: requests.Session) -> None:
+    """Persists the session cookies so the next process can skip the priming request."""
+    jar = LWPCookieJar(COOKIE_JAR_PATH)
+    for cookie in session.cookies:
+        jar.set_cookie(cookie)
+    try:
+        # Owner-only: the jar holds session cookies (chmod also covers a pre-existing file)
+        COOKIE_JAR_PATH.touch(mode=0o600, exist_ok=True)
+        COOKIE_JAR_PATH.chmod(0o600)
+        jar.save(ignore_discard=True)
+    except OSError:
+        pass  # Read-only filesystem: cookies are simply primed again next time
+
+@st.cache_resource(ttl=SESSION_MAX_AGE, show_spinner=False)
 def create_session() -> requests.Session:
-    """Create or refresh the requests session with automatic cookies."""
-    global SESSION, SESSION_TIMESTAMP
-    now = time.time()
-    if SESSION and (now - SESSION_TIMESTAMP) < SESSION_MAX_AGE:
-        return SESSION  # reuse existing session
+    """Create the shared requests session (pooled keep-alive connections + cookies).
 
+    One instance is shared by every rerun and user; it is rebuilt only once it is
+    older than SESSION_MAX_AGE. Cookies saved on disk by a recent process are reused
+    instead of visiting the job offers page again.
+    """
     session = requests.Session()
     retry_strategy = Retry(
         total=5,
-        backoff_factor=1,
+        # Immediate first retry, then 1s, 2s, 4s, ...; a 429/503 Retry-After header (honoured by
+        # default) takes precedence, so rate limiting is left to the server
+        backoff_factor=0.5,
         status_forcelist=[429, 500, 502, 503, 504],
         allowed_methods=["GET", "POST"]
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    # Never fewer pooled sockets than worker threads; pool_block=False opens an extra
+    # connection instead of stalling a worker if the pool is ever exhausted
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=2 * MAX_WORKERS,
+                          pool_block=False, max_retries=retry_strategy)
     session.mount("https://", adapter)
+    session.mount("http://", adapter)
 
     session.headers.update({
         "accept": "*/*",
         "content-type": "application/json",
         "origin": "https://www.lvmh.com",
-        "referer": "https://www.lvmh.com/en/join-us/our-job-offers",
+        "referer": JOB_OFFERS_URL,
         "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36"
     })
 
-    # Refresh cookies by visiting the job offers page
-    try:
-        session.get("https://www.lvmh.com/en/join-us/our-job-offers", timeout=15)
-    except requests.RequestException as e:
-        st.warning(f"Could not initialize session cookies: {e}")
+    # Refresh cookies by visiting the job offers page, unless recent ones are saved on disk
+    if not load_saved_cookies(session):
+        try:
+            resp = session.get(JOB_OFFERS_URL, timeout=15)
+            # Never persist cookies from an error or bot-check page across restarts
+            if resp.ok:
+                save_cookies(session)
+        except requests.RequestException as e:
+            st.warning(f"Could not initialize session cookies: {e}")
 
-    SESSION = session
-    SESSION_TIMESTAMP = time.time()
     return session
 
+# -------------------------------------------------------------------
+## 💾 On-disk Scrape Cache
+
+def _scrape_cache_path(keyword: Optional[str], regions: Sequence[str]) -> Path:
+    """Stable (process-independent) cache file name for a keyword/regions query."""
+    key = json_dumps([keyword or "", sorted(regions)])
+    return SCRAPE_CACHE_DIR / f"jobs-{hashlib.sha1(key).hexdigest()}.parquet"
+
+def load_cached_scrape(keyword: Optional[str], regions: Sequence[str]) -> Optional[pd.DataFrame]:
+    """Returns a scrape saved by a previous app process if it is younger than SCRAPE_DISK_MAX_AGE."""
+    path = _scrape_cache_path(keyword, regions)
+    try:
+        if time.time() - path.stat().st_mtime < SCRAPE_DISK_MAX_AGE:
+            return pd.read_parquet(path)
+    except (OSError, ValueError):
+        pass  # Missing or unreadable cache file: scrape again
+    return None
+
+def evict_expired_scrapes() -> None:
+    """Deletes cache files too old to be reused (and temp files left by interrupted writes)."""
+    cutoff = time.time() - SCRAPE_DISK_MAX_AGE
+    for path in chain(SCRAPE_CACHE_DIR.glob("jobs-*.parquet"), SCRAPE_CACHE_DIR.glob("jobs-*.tmp")):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass  # Already removed by another process
+
+def save_cached_scrape(keyword: Optional[str], regions: Sequence[str], df: pd.DataFrame) -> None:
+    """Persists a complete scrape as Parquet (dictionary-encoded, compact for repetitive columns)."""
+    path = _scrape_cache_path(keyword, regions)
+    tmp_path = None
+    try:
+        SCRAPE_CACHE_DIR.mkdir(exist_ok=True)
+        evict_expired_scrapes()
+        # A unique temp file per writer, so concurrent saves of one query never interleave
+        with tempfile.NamedTemporaryFile(dir=SCRAPE_CACHE_DIR, prefix=f"{path.stem}-",
+                                         suffix=".tmp", delete=False) as tmp_file:
+            tmp_path = Path(tmp_file.name)
+            df.to_parquet(tmp_file, index=False, compression='zstd')
+        tmp_path.replace(path)  # Atomic swap so concurrent readers never see a partial file
+    except (OSError, ValueError, TypeError, NotImplementedError):
+        # Columns pyarrow cannot serialize: skip the disk cache, keep the result
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+
 # -------------------------------------------------------------------
 ## 🔍 Fetching Functions
 
-def fetch_jobs_page(session: requests.Session, regions: List[str], keyword: Optional[str] = None, page: int = 0) -> dict:
+class ScrapeError(Exception):
+    """Raised when a scrape cannot fetch every page, so no partial result is ever cached."""
+
+def fetch_jobs_page(session: requests.Session, regions: Sequence[str], keyword: Optional[str] = None, page: int = 0) -> dict:
     """Fetch a single page of jobs from the API."""
     facet_filters = [[f"geographicAreaFilter:{r}" for r in regions]]
     payload = {
@@ -71,11 +196,11 @@ def fetch_jobs_page(session: requests.Session, regions: List[str], keyword: Opti
             {
                 "indexName": "PRD-en-us-timestamp-desc",
                 "params": {
+                    "attributesToHighlight": [],  # No highlight markup to send or strip
                     "facetFilters": facet_filters,
                     "facets": ["businessGroupFilter", "cityFilter", "contractFilter", "countryRegionFilter"],
                     "filters": "category:job",
-                    "highlightPostTag": "__/ais-highlight__",
-                    "highlightPreTag": "__ais-highlight__",
+                    "getRankingInfo": False,
                     "hitsPerPage": HITS_PER_PAGE,
                     "maxValuesPerFacet": 100,
                     "page": page,
@@ -84,48 +209,119 @@ def fetch_jobs_page(session: requests.Session, regions: List[str], keyword: Opti
             }
         ]
     }
-    resp = session.post(URL, json=payload, timeout=30)
+    # Pre-serialized body; the session already sends "content-type: application/json"
+    resp = session.post(URL, data=json_dumps(payload), timeout=30)
     resp.raise_for_status()
-    return resp.json()
+    try:
+        return json_loads(resp.content)
+    except ValueError as e:
+        # A 200 HTML/bot-check page: orjson's decode error is a ValueError, not a RequestException
+        raise requests.exceptions.InvalidJSONError(f"Response is not valid JSON: {e}", response=resp) from e
 
 def extract_jobs(data: dict) -> List[dict]:
-    """Extract jobs from the JSON response."""
-    jobs = []
-    for query_result in data.get("results", []):
-        for hit in query_result.get("hits", []):
-            jobs.append(hit)
-    return jobs
-
-@st.cache_data(ttl=3600)  # Cache the scraped data for 1 hour
-def scrape_jobs(keyword: Optional[str], selected_regions: List[str], _progress_bar=None) -> pd.DataFrame:
-    """Scrape all jobs for given regions and keyword, with optional progress bar."""
-    session = create_session()
-    all_jobs = []
+    """Extract jobs from the JSON response (one query per request, so one result)."""
+    results = data.get("results")
+    return results[0].get("hits", []) if results else []
+
+@st.cache_resource(ttl=SCRAPE_CACHE_TTL, show_spinner=False)  # Cache the scraped data for 1 hour
+def scrape_jobs(keyword: Optional[str], selected_regions: Tuple[str, ...], _progress_bar=None) -> pd.DataFrame:
+    """Scrape all jobs for given regions and keyword, with optional progress bar.
+
+    ``selected_regions`` must be a sorted tuple so identical selections share a
+    cache entry; ``_progress_bar`` is excluded from the cache key by its underscore.
+    The frame is cached as a shared resource (no pickle copy per hit), so callers
+    must treat it as read-only.
+
+    Results younger than ``SCRAPE_DISK_MAX_AGE`` are served from the on-disk cache, so
+    they survive app restarts. Otherwise page 0 is fetched first to learn ``nbPages``
+    and the remaining pages are fetched concurrently over the shared keep-alive session.
+
+    Raises ScrapeError if any page fails (after the adapter's retries): st.cache_resource
+    does not cache exceptions, so a frame with missing pages is never served to other users.
+    """
     regions_to_use = selected_regions if selected_regions else REGIONS_ALL
-    page = 0
-    total_fetched = 0
-    
-    while True:
-        try:
-            data = fetch_jobs_page(session, regions_to_use, keyword, page)
-            jobs = extract_jobs(data)
-            if not jobs:
-                break
-            all_jobs.extend(jobs)
-            total_fetched += len(jobs)
-            page += 1
+    cached_df = load_cached_scrape(keyword, regions_to_use)
+    if cached_df is not None:
+        cached_df.attrs['scrape_id'] = uuid.uuid4().hex
+        return cached_df
+
+    session = create_session()
+
+    try:
+        first_page = fetch_jobs_page(session, regions_to_use, keyword, 0)
+    except requests.RequestException as e:
+        raise ScrapeError(f"Request failed on page 0: {e}") from e
+
+    results = first_page.get("results", [])
+    nb_pages = results[0].get("nbPages", 1) if results else 1
+    pages = {0: extract_jobs(first_page)}
+    failures = []
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = {
+            pool.submit(fetch_jobs_page, session, regions_to_use, keyword, page): page
+            for page in range(1, nb_pages)
+        }
+        for pages_done, future in enumerate(as_completed(futures), start=2):
+            page = futures[future]
+            try:
+                pages[page] = extract_jobs(future.result())
+            except requests.RequestException as e:
+                failures.append(f"page {page}: {e}")
             if _progress_bar:
-                # Max 1.0 for Streamlit progress bar, assuming max ~2500 jobs
-                _progress_bar.progress(min(total_fetched / 2500, 1.0)) 
-            time.sleep(0.5)  # polite delay
-        except requests.RequestException as e:
-            st.error(f"Request failed on page {page}. Stopping scrape: {e}")
-            break
-    return pd.DataFrame(all_jobs)
+                _progress_bar.progress(min(pages_done / nb_pages, 1.0))
+
+    if failures:
+        raise ScrapeError(f"Scrape incomplete, {len(failures)} request(s) failed: " + "; ".join(failures))
+
+    # Keep the index ordering (newest first) regardless of completion order
+    all_jobs = chain.from_iterable(pages[page] for page in sorted(pages))
+    df = optimize_dtypes(pd.DataFrame.from_records(all_jobs))
+    if not df.empty:
+        save_cached_scrape(keyword, regions_to_use, df)
+    df.attrs['scrape_id'] = uuid.uuid4().hex  # Identifies this scrape for frame_fingerprint
+    return df
 
 # -------------------------------------------------------------------
 ## ✨ Data Processing Functions
 
+def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Stores repetitive label columns as categoricals and other text columns as Arrow strings.
+
+    Arrow-backed strings are compact, hash quickly for the st.cache_data keys and
+    run the .str methods on Arrow compute kernels instead of per-object Python calls.
+    """
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            try:
+                df[col] = df[col].astype('category')
+            except TypeError:
+                pass  # Leave list-valued (unhashable) columns as they are
+    for col in df.select_dtypes(include='object').columns:
+        if pd.api.types.infer_dtype(df[col], skipna=True) == 'string':
+            df[col] = df[col].astype('string[pyarrow]')
+    return df
+
+def frame_fingerprint(df: pd.DataFrame) -> Hashable:
+    """Cheap st.cache_data hash for frames coming from scrape_jobs.
+
+    Every scrape is stamped with a unique ``attrs['scrape_id']``, which pandas carries
+    through column selection/renaming, so id + shape + columns identifies a frame
+    without hashing every description string. Unstamped frames get a full content hash.
+
+    Only unmodified scrape_jobs output (or the create_filtered_df result for it) may be
+    passed with the stamp: pandas also copies ``attrs`` through .copy(), .loc edits and
+    most other operations, so an edited frame would get stale cached results. Code that
+    modifies a frame must ``attrs.pop('scrape_id', None)`` on it first.
+    """
+    scrape_id = df.attrs.get('scrape_id')
+    if scrape_id is not None:
+        return (scrape_id, df.shape, tuple(df.columns))
+    try:
+        return pd.util.hash_pandas_object(df).to_numpy().tobytes()
+    except TypeError:  # Unhashable (list/dict) cells
+        return pickle.dumps(df)
+
 def fix_encoding(text: str) -> str:
     """Attempts to fix double-encoded UTF-8 strings."""
     if isinstance(text, str):
@@ -135,45 +331,65 @@ def fix_encoding(text: str) -> str:
             return text
     return text
 
+def fix_encoding_series(s: pd.Series) -> pd.Series:
+    """Vectorized fix_encoding: only cells with non-ASCII characters can be double-encoded."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.map(fix_encoding)  # Runs once per category, not once per row
+    if not pd.api.types.is_string_dtype(s):
+        return s.map(fix_encoding)
+    needs_fix = s.str.contains(r'[^\x00-\x7f]', regex=True, na=False)
+    if not needs_fix.any():
+        return s
+    return s.where(~needs_fix, s[needs_fix].map(fix_encoding))
+
+# Every scrape gets a new scrape_id, so entries for older scrapes expire with the scrape
+@st.cache_data(ttl=SCRAPE_CACHE_TTL, show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
 def create_filtered_df(df: pd.DataFrame) -> pd.DataFrame:
-    """Applies all cleaning, merging, slug creation, column renaming logic, and sets final column order."""
+    """Applies all cleaning, merging, slug creation, column renaming logic, and sets final column order.
+
+    The input frame is left untouched: only the columns used here are copied and cleaned.
+    """
     if df.empty:
         return pd.DataFrame()
 
+    # Column selection is copy-on-write: the writes below never reach the cached raw frame
+    df = df[[col for col in FILTERED_SOURCE_FIELDS if col in df.columns]]
+    source_cols = set(df.columns)  # O(1) membership tests for the steps below
+
     # 1. Encoding Fix
     for col in ['city', 'description', 'name', 'profile', 'jobResponsabilities', 'salary']:
-        if col in df.columns:
-            df[col] = df[col].apply(fix_encoding)
+        if col in source_cols:
+            df[col] = fix_encoding_series(df[col])
+
+    # Text columns are converted once to Arrow-backed strings ('' for missing values), so the
+    # .str calls below run on Arrow kernels without per-step astype(str)/fillna conversions
+    for col in ['name', 'maison', 'city', 'description', 'profile', 'jobResponsabilities']:
+        if col in source_cols:
+            df[col] = df[col].astype('string[pyarrow]').fillna('')
 
     # 2. Salary Placeholder
-    df['Salary Range'] = df['salary'] if 'salary' in df.columns else ''
+    df['Salary Range'] = df['salary'] if 'salary' in source_cols else ''
 
     # 3. Merge Full Description
-    if all(col in df.columns for col in ['profile', 'jobResponsabilities', 'description']):
-        df['FullDescription'] = ''
-        for col in ['profile', 'jobResponsabilities', 'description']:
-            df[col] = df[col].astype(str).str.strip()
-            df['FullDescription'] += "\n\n--- " + col.upper() + " ---\n" + df[col]
-        df['description'] = df['FullDescription'].str.strip()
+    description_cols = ['profile', 'jobResponsabilities', 'description']
+    if all(col in source_cols for col in description_cols):
+        # One n-ary str.cat builds the result
+        sections = ["\n\n--- " + col.upper() + " ---\n" + df[col].str.strip() for col in description_cols]
+        df['description'] = sections[0].str.cat(sections[1:]).str.strip()
 
     # Prevent formula interpretation in Excel
-    if 'description' in df.columns:
-        df['description'] = np.where(df['description'].str.startswith(('=', '+', '-')),
-                                            "'" + df['description'], df['description'])
+    if 'description' in source_cols:
+        # One slice + set lookup on the first character instead of a startswith pass per prefix
+        starts_with_formula = df['description'].str[:1].isin(('=', '+', '-'))
+        df.loc[starts_with_formula, 'description'] = "'" + df.loc[starts_with_formula, 'description']
 
     # 4. Slug Creation (FIXED ORDER: Company-Name-Location)
-    if all(col in df.columns for col in ['name', 'maison', 'city']):
-        cleaned_maison = df['maison'].astype(str).str.strip()
-        cleaned_name = df['name'].astype(str).str.strip()
-        cleaned_city = df['city'].astype(str).str.strip()
-        
-        df['Slug'] = (cleaned_maison.str.lower().str.replace(' ', '-') + '-' +
-                      cleaned_name.str.lower().str.replace(' ', '-') + '-' +
-                      cleaned_city.str.lower().str.replace(' ', '-'))
-        
-        # Robust cleaning: remove non-alphanumeric chars (except hyphen) and clean up multiple hyphens
-        df['Slug'] = df['Slug'].str.replace(r'[^a-z0-9\-]+', '-', regex=True)
-        df['Slug'] = df['Slug'].str.replace(r'[\-]+', '-', regex=True).str.strip('-')
+    if all(col in source_cols for col in ['name', 'maison', 'city']):
+        # One n-ary str.cat instead of four chained '+' intermediates, lower-cased once
+        slug_source = df['maison'].str.cat([df['name'], df['city']], sep='-').str.lower()
+
+        # Single pass: every run of non-alphanumeric chars (spaces, punctuation, hyphens) becomes one hyphen
+        df['Slug'] = slug_source.str.replace(SLUG_SEPARATOR_PATTERN, '-', regex=True).str.strip('-')
     else:
         df['Slug'] = ''
 
@@ -191,35 +407,59 @@ def create_filtered_df(df: pd.DataFrame) -> pd.DataFrame:
         'Salary Range': 'Salary Range'
     }
     # Select and rename columns that exist in the raw dataframe
-    existing_cols = [col for col in column_map.keys() if col in df.columns]
+    # ('Salary Range' and 'Slug' are derived above, so check the live columns here)
+    existing_cols = [col for col in column_map if col in df.columns]
     df_filtered = df[existing_cols].rename(columns=column_map)
 
-    # 6. Add Blank Columns
+    # 6. Final Column Order (blank CMS columns are created by the reindex itself)
     blank_columns = ['Collection ID', 'Locale ID', 'Item ID', 'Archived', 'Draft',
                      'Created On', 'Updated On', 'Published On', 'CMS ID', 'Access', 'Salary', 'Deadline']
-    for col in blank_columns:
-        df_filtered[col] = ''
-
-    # 7. Clean Algolia highlights
-    if 'Description' in df_filtered.columns:
-        df_filtered['Description'] = df_filtered['Description'].astype(str).str.replace('__ais-highlight__', '').str.replace('__/ais-highlight__', '')
-
-    # 8. Final Column Order
     final_order = ['Name', 'Slug', 'Collection ID', 'Locale ID', 'Item ID', 'Archived',
                    'Draft', 'Created On', 'Updated On', 'Published On', 'CMS ID',
                    'Company', 'Type', 'Description', 'Salary Range', 'Access',
                    'Location', 'Industry', 'Level', 'Salary', 'Deadline', 'Apply URL']
-    
-    # Reindex the dataframe to enforce the exact order
-    df_filtered = df_filtered.reindex(columns=[col for col in final_order if col in df_filtered.columns])
+
+    # One reindex enforces the exact order and fills the blank columns with ''
+    output_cols = set(df_filtered.columns).union(blank_columns)
+    df_filtered = df_filtered.reindex(
+        columns=[col for col in final_order if col in output_cols],
+        fill_value=''
+    )
 
     return df_filtered
 
-@st.cache_data
+@st.cache_data(ttl=SCRAPE_CACHE_TTL, hash_funcs={pd.DataFrame: frame_fingerprint})
 def convert_df_to_csv(df: pd.DataFrame) -> bytes:
-    """Converts DataFrame to CSV string with BOM for Excel compatibility."""
-    # Use utf-8-sig which automatically includes the BOM
-    return df.to_csv(index=False, encoding='utf-8-sig').encode('utf-8-sig')
+    """Converts DataFrame to CSV bytes with BOM for Excel compatibility.
+
+    Arrow's CSV format differs from DataFrame.to_csv: the header and every string
+    value are quoted, booleans are written as true/false and whole floats without
+    the trailing .0 (1.0 -> 1). Frames Arrow cannot convert keep the to_csv format.
+    """
+    buffer = io.BytesIO()
+    buffer.write(codecs.BOM_UTF8)
+    try:
+        # pyarrow's multithreaded C++ writer is several times faster than DataFrame.to_csv
+        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buffer)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # Nested (list/dict) or mixed-type cells that Arrow cannot write: use pandas instead;
+        # utf-8-sig writes the BOM
+        buffer = io.BytesIO()
+        df.to_csv(buffer, index=False, encoding='utf-8-sig')
+    return buffer.getvalue()
+
+@st.cache_data(ttl=SCRAPE_CACHE_TTL, hash_funcs={pd.DataFrame: frame_fingerprint})
+def convert_df_to_parquet(df: pd.DataFrame) -> Optional[bytes]:
+    """Converts DataFrame to zstd-compressed Parquet bytes; None if Arrow cannot serialize it.
+
+    Much faster to write and several times smaller than the CSV, and it keeps the column dtypes.
+    """
+    buffer = io.BytesIO()
+    try:
+        df.to_parquet(buffer, index=False, compression='zstd')
+    except (ValueError, TypeError, NotImplementedError):
+        return None
+    return buffer.getvalue()
 
 # -------------------------------------------------------------------
 ## 💻 Streamlit UI
@@ -233,35 +473,54 @@ if st.button("Fetch Jobs"):
     progress_bar = st.progress(0)
     with st.spinner("Scraping jobs... this may take a few minutes..."):
         try:
-            df_raw = scrape_jobs(keyword_input.strip() if keyword_input else None, regions_input, _progress_bar=progress_bar)
-            progress_bar.empty()
-
-            if not df_raw.empty:
-                st.success(f"Found {len(df_raw)} jobs!")
-
-                df_filtered = create_filtered_df(df_raw.copy())
-                st.dataframe(df_filtered, use_container_width=True)
-
-                # --- TWO SEPARATE DOWNLOAD BUTTONS (CSV with BOM) ---
-                csv_raw = convert_df_to_csv(df_raw)
-                csv_filtered = convert_df_to_csv(df_filtered)
+            st.session_state.raw_df = scrape_jobs(keyword_input.strip() if keyword_input else None, tuple(sorted(regions_input)), _progress_bar=progress_bar)
+        except ScrapeError as e:
+            st.session_state.pop('raw_df', None)
+            st.error(f"{e}. Nothing was cached; please try again.")
+        except Exception as e:
+            st.session_state.pop('raw_df', None)
+            st.error(f"An unexpected error occurred: {e}")
+    progress_bar.empty()
 
-                st.subheader("Download CSVs")
-                st.download_button(
-                    "Download Full Raw Data CSV",
-                    data=csv_raw,
-                    file_name="lvmh_jobs_FULL_RAW.csv",
-                    mime="text/csv"
-                )
+# The last scrape lives in session_state, so reruns (e.g. a download click) re-render it
+# from the cached frames instead of losing the results or scraping again
+if 'raw_df' in st.session_state:
+    df_raw = st.session_state.raw_df
+    try:
+        if not df_raw.empty:
+            st.success(f"Found {len(df_raw)} jobs!")
+
+            df_filtered = create_filtered_df(df_raw)
+            st.dataframe(df_filtered, use_container_width=True)
+
+            # --- DOWNLOAD BUTTONS (two CSVs with BOM, plus the raw data as Parquet) ---
+            csv_raw = convert_df_to_csv(df_raw)
+            csv_filtered = convert_df_to_csv(df_filtered)
+            parquet_raw = convert_df_to_parquet(df_raw)
+
+            st.subheader("Download Data")
+            st.download_button(
+                "Download Full Raw Data CSV",
+                data=csv_raw,
+                file_name="lvmh_jobs_FULL_RAW.csv",
+                mime="text/csv"
+            )
+            st.download_button(
+                "Download Filtered CSV",
+                data=csv_filtered,
+                file_name="lvmh_jobs_FILTERED_CLEAN.csv",
+                mime="text/csv"
+            )
+            if parquet_raw is not None:
                 st.download_button(
-                    "Download Filtered CSV",
-                    data=csv_filtered,
-                    file_name="lvmh_jobs_FILTERED_CLEAN.csv",
-                    mime="text/csv"
+                    "Download Full Raw Data Parquet",
+                    data=parquet_raw,
+                    file_name="lvmh_jobs_FULL_RAW.parquet",
+                    mime="application/vnd.apache.parquet"
                 )
 
-            else:
-                st.warning("No jobs found. Try different search criteria.")
+        else:
+            st.warning("No jobs found. Try different search criteria.")
 
-        except Exception as e:
-            st.error(f"An unexpected error occurred: {e}")
+    except Exception as e:
+        st.error(f"An unexpected error occurred: {e}")